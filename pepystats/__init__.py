@@ -1 +1 @@
-from .api import get_overall, get_detailed, get_versions, to_markdown, to_csv
+from .api import get_overall, get_detailed, get_versions, to_markdown, to_csv, to_wide, render_wide
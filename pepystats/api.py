@@ -1,12 +1,66 @@
 from __future__ import annotations
 
+import functools
+import io
+import json
 import os
-from typing import Iterable, Optional, Dict, Any
+import sys
+from typing import Iterable, Optional, Dict, Any, List, Set
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # optional: faster JSON decoding of large payloads
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - exercised only without the extra
+    _json_loads = json.loads
+
+try:  # optional: incremental JSON decoding for filtered version queries
+    import ijson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    ijson = None
 
 BASE = "https://api.pepy.tech"
+CACHE_NAME = os.path.join(os.path.expanduser("~"), ".cache", "pepystats")
+CACHE_TTL = 3600  # seconds; pepy.tech refreshes daily
+
+# One pooled session per process so successive calls reuse the HTTPS connection.
+# Created lazily so importing the module never touches the cache file.
+_SESSION: Optional[requests.Session] = None
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _make_session() -> requests.Session:
+    s: Optional[requests.Session] = None
+    if not _env_flag("PEPYSTATS_NO_CACHE"):
+        try:  # optional: on-disk HTTP cache with ETag/Last-Modified revalidation
+            import requests_cache
+        except ImportError:
+            pass
+        else:
+            s = requests_cache.CachedSession(
+                cache_name=CACHE_NAME,
+                backend="sqlite",
+                expire_after=CACHE_TTL,
+                cache_control=True,
+                stale_if_error=True,
+            )
+    if s is None:
+        s = requests.Session()
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return s
+
+
+def _session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _make_session()
+    return _SESSION
 
 
 def _headers(api_key: Optional[str]) -> Dict[str, str]:
@@ -14,89 +68,246 @@ def _headers(api_key: Optional[str]) -> Dict[str, str]:
     return {"X-API-Key": key} if key else {}
 
 
+def _is_cached(session: requests.Session) -> bool:
+    if "requests_cache" not in sys.modules:
+        return False  # a CachedSession would already have loaded it
+    import requests_cache
+    return isinstance(session, requests_cache.CachedSession)
+
+
+def _http_get(url: str, **kwargs: Any) -> requests.Response:
+    return _session().get(url, **kwargs)
+
+
+def _get_project(project: str, api_key: Optional[str], **kwargs: Any) -> requests.Response:
+    url = f"{BASE}/api/v2/projects/{project}"
+    r = _http_get(url, headers=_headers(api_key), timeout=30, **kwargs)
+    try:
+        if r.status_code == 401:
+            raise RuntimeError("Unauthorized (401) from pepy.tech. Set PEPY_API_KEY or pass api_key.")
+        r.raise_for_status()
+    except Exception:
+        r.close()  # hand a streamed connection back to the pool
+        raise
+    return r
+
+
+def _fetch_project(project: str, api_key: Optional[str]) -> Dict[str, Any]:
+    return _json_loads(_get_project(project, api_key).content)
+
+
+def _stream_versions(project: str, api_key: Optional[str], want: Set[str]) -> Dict[str, Any]:
+    """
+    Decode ``downloads`` incrementally, keeping only the wanted versions, so
+    the full payload for very large projects is never held in memory. Only
+    used with an uncached session: requests-cache buffers the whole body anyway.
+    """
+    # Closing the response returns the pooled connection even if ijson fails mid-body.
+    with _get_project(project, api_key, stream=True) as r:
+        r.raw.decode_content = True  # let urllib3 undo gzip/deflate
+        return {
+            date: {ver: count for ver, count in ver_map.items() if ver in want}
+            for date, ver_map in ijson.kvitems(r.raw, "downloads")
+            if isinstance(ver_map, dict)
+        }
+
+
 def _parse_v2_downloads(data: Dict[str, Any]) -> Dict[str, Any]:
     return data.get("downloads") or {}
 
 
-def _to_naive_utc(series: pd.Series) -> pd.Series:
-    return pd.to_datetime(series, utc=True).dt.tz_localize(None)
+def _v2_totals(downloads: Dict[str, Any]) -> pd.DataFrame:
+    """Sum each date's version counts into a tidy [date, downloads, label='total'] frame."""
+    if not downloads:
+        return pd.DataFrame(columns=["date", "downloads", "label"])
+    if all(isinstance(v, dict) for v in downloads.values()):
+        # C-level sum per version map straight into an int64 array; filter(None, ...)
+        # drops null counts. Much cheaper than materialising a date × version frame.
+        totals = np.fromiter(
+            (sum(filter(None, v.values())) for v in downloads.values()),
+            dtype=np.int64,
+            count=len(downloads),
+        )
+    else:
+        # Older payloads may carry a plain per-day number instead of a version map.
+        totals = [
+            sum(int(c or 0) for c in v.values()) if isinstance(v, dict) else int(v or 0)
+            for v in downloads.values()
+        ]
+    label = pd.Categorical.from_codes(np.zeros(len(downloads), dtype=np.int8), categories=["total"])
+    return pd.DataFrame({"date": list(downloads), "downloads": totals, "label": label})
+
+
+def _v2_versions(downloads: Dict[str, Any], want: Set[str]) -> pd.DataFrame:
+    """Flatten the per-date version maps into a tidy [date, downloads, label=<version>] frame."""
+    # Parallel column lists + one int64 array: no per-row dicts for pandas to inspect.
+    dates, counts, labels = [], [], []
+    for date, ver_map in downloads.items():
+        if not isinstance(ver_map, dict):
+            continue
+        for ver, count in ver_map.items():
+            if not want or ver in want:
+                dates.append(date)
+                counts.append(count or 0)
+                labels.append(ver)
+    return pd.DataFrame({
+        "date": dates,
+        "downloads": np.asarray(counts, dtype=np.int64),
+        "label": pd.Categorical(labels),  # few distinct versions, many rows
+    })
+
+
+def _parse_dates(series: pd.Series) -> pd.Series:
+    # pepy.tech dates are plain UTC calendar days (YYYY-MM-DD): an explicit format
+    # keeps pandas on its fast parser and the result is naive by construction.
+    return pd.to_datetime(series, format="%Y-%m-%d")
+
+
+@functools.lru_cache(maxsize=16)
+def _cutoff_for(months: int, today: pd.Timestamp) -> pd.Timestamp:
+    return today - pd.DateOffset(months=months)
+
+
+def _cutoff(months: int) -> pd.Timestamp:
+    """Start of the ``months`` window, reused for repeated calls on the same UTC day."""
+    today = pd.Timestamp.now(tz="UTC").normalize().tz_localize(None)
+    return _cutoff_for(months, today)
 
 
 def _trim_months(df: pd.DataFrame, months: Optional[int]) -> pd.DataFrame:
+    """Keep rows within the last ``months`` months; expects a parsed ``date`` column."""
     if df.empty or not months or months <= 0:
         return df
-    out = df.copy()
-    out["date"] = _to_naive_utc(out["date"])
-    now_naive = pd.Timestamp.now(tz="UTC").normalize().tz_localize(None)
-    cutoff = now_naive - pd.DateOffset(months=months)
-    out = out[out["date"] >= cutoff]
-    out["date"] = out["date"].dt.strftime("%Y-%m-%d")
-    return out
+    return df[df["date"] >= _cutoff(months)]
 
 
-def _complete_range(df: pd.DataFrame, freq: str) -> pd.DataFrame:
-    """For each label, reindex to a complete date range and fill zeros."""
-    if df.empty:
-        return df
+_FREQS = {"daily": "D", "weekly": "W-SAT", "monthly": "MS", "yearly": "YS"}
 
-    frames = []
-    for label, grp in df.groupby("label"):
-        g = grp.copy()
-        g["date"] = _to_naive_utc(g["date"])
-        g = g.set_index("date").sort_index()
 
-        # Build a complete index from min..max for this label
-        start = g.index.min().normalize()
-        end = g.index.max().normalize()
-        full_idx = pd.date_range(start, end, freq=freq)
+_PARALLEL_MIN_LABELS = 16
+_PARALLEL_CHUNK = 32
 
-        s = g["downloads"].astype("int64").reindex(full_idx, fill_value=0)
-        out = s.reset_index().rename(columns={"index": "date"})
-        out["label"] = label
-        frames.append(out)
 
-    out = pd.concat(frames, ignore_index=True)
-    out["date"] = out["date"].dt.strftime("%Y-%m-%d")
-    return out[["date", "downloads", "label"]]
+def _resample_chunk(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    return df.set_index("date").groupby("label", observed=True)["downloads"].resample(freq).sum().reset_index()
 
 
+def _resample_parallel(
+    df: pd.DataFrame, labels: List[str], freq: str, n_jobs: int
+) -> Optional[pd.DataFrame]:
+    """Resample label chunks with joblib; ``None`` if joblib is not installed."""
+    try:  # imported here so serial runs never pay for it
+        from joblib import Parallel, delayed
+    except ImportError:
+        return None
+    chunks = [
+        df[df["label"].isin(labels[i:i + _PARALLEL_CHUNK])]
+        for i in range(0, len(labels), _PARALLEL_CHUNK)
+    ]
+    parts = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_resample_chunk)(chunk, freq) for chunk in chunks
+    )
+    return pd.concat(parts, ignore_index=True)
 
-def _apply_granularity(df: pd.DataFrame, granularity: str) -> pd.DataFrame:
+
+def _apply_granularity(df: pd.DataFrame, granularity: str, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    Resample every label in one groupby pass. Buckets run from each label's
+    first to last date, so gaps (days for ``daily``) come back as zeros.
+
+    With ``n_jobs != 1`` and joblib installed, frames with many labels are
+    split into label chunks and resampled in parallel.
+    """
     if df.empty:
         return df
 
-    if granularity == "daily":
-        return _complete_range(df, "D")
-
-    freq = None
-    if granularity == "weekly":
-        freq = "W-SAT"
-    elif granularity == "monthly":
-        freq = "MS"
-    elif granularity == "yearly":
-        freq = "YS"
-    else:
+    freq = _FREQS.get(granularity)
+    if freq is None:
         return df  # unknown → leave as-is
 
-    frames = []
-    for label, grp in df.groupby("label"):
-        g = grp.copy()
-        g["date"] = _to_naive_utc(g["date"])
-        g = g.set_index("date").sort_index()
+    if df["label"].nunique() == 1:
+        # One series (e.g. detailed totals): resample it directly, no groupby.
+        res = df.set_index("date")["downloads"].resample(freq).sum()
+        label = pd.Categorical.from_codes(
+            np.zeros(len(res), dtype=np.int8), categories=[df["label"].iloc[0]]
+        )
+        return pd.DataFrame({"date": res.index, "downloads": res.to_numpy(), "label": label})
+
+    out = None
+    labels = sorted(df["label"].unique())
+    if n_jobs != 1 and len(labels) > _PARALLEL_MIN_LABELS:
+        out = _resample_parallel(df, labels, freq, n_jobs)
+    if out is None:
+        out = _resample_chunk(df, freq)
+    return out[["date", "downloads", "label"]]
 
-        res = g["downloads"].resample(freq).sum()
 
-        # Ensure empty periods are present with zero
-        full_idx = pd.date_range(res.index.min(), res.index.max(), freq=freq)
-        res = res.reindex(full_idx, fill_value=0)
+def _finalize(
+    df: pd.DataFrame,
+    months: Optional[int],
+    granularity: str,
+    n_jobs: int = 1,
+    backend: str = "pandas",
+) -> pd.DataFrame:
+    """Parse dates once, trim, resample, and render dates as ``YYYY-MM-DD``."""
+    if backend == "polars":
+        return _finalize_polars(df, months, granularity)
+    if backend != "pandas":
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'pandas' or 'polars')")
+    if df.empty:
+        return df
+    df = df.assign(date=_parse_dates(df["date"]))
+    df = _trim_months(df, months)
+    df = _apply_granularity(df, granularity, n_jobs)
+    if df.empty:
+        return df
+    return df.assign(date=df["date"].dt.strftime("%Y-%m-%d"))
 
-        out = res.reset_index().rename(columns={"index": "date"})
-        out["label"] = label
-        frames.append(out)
 
-    out = pd.concat(frames, ignore_index=True)
-    out["date"] = out["date"].dt.strftime("%Y-%m-%d")
-    return out[["date", "downloads", "label"]]
+# polars equivalents of _FREQS; weekly buckets are first shifted to their Saturday.
+_PL_EVERY = {"daily": "1d", "weekly": "1w", "monthly": "1mo", "yearly": "1y"}
+
+
+def _finalize_polars(df: pd.DataFrame, months: Optional[int], granularity: str) -> pd.DataFrame:
+    """Same contract as _finalize, with the trim/resample done in polars."""
+    try:  # imported here so the default pandas backend never pays for it
+        import polars as pl
+    except ImportError:
+        raise ImportError('backend="polars" requires polars (pip install "pepystats[polars]")') from None
+    if df.empty:
+        return df
+
+    frame = pl.DataFrame({
+        "date": df["date"].to_numpy(),
+        "downloads": df["downloads"].to_numpy(),
+        "label": df["label"].to_numpy(),
+    }).with_columns(pl.col("date").str.strptime(pl.Datetime, "%Y-%m-%d"))
+    if months and months > 0:
+        frame = frame.filter(pl.col("date") >= _cutoff(months).to_pydatetime())
+
+    every = _PL_EVERY.get(granularity)
+    if every is not None and frame.height:
+        bucket = pl.col("date")
+        if granularity == "weekly":  # W-SAT: label each day with the Saturday ending its week
+            bucket = bucket.dt.offset_by(((6 - bucket.dt.weekday()) % 7).cast(pl.String) + "d")
+        elif granularity in ("monthly", "yearly"):
+            bucket = bucket.dt.truncate(every)
+        frame = (
+            frame.with_columns(bucket)
+            .group_by("label", "date")
+            .agg(pl.col("downloads").sum())
+            .sort("label", "date")
+            .upsample(time_column="date", every=every, group_by="label")
+            .with_columns(pl.col("downloads").fill_null(0), pl.col("label").forward_fill())
+        )
+
+    frame = frame.with_columns(pl.col("date").dt.strftime("%Y-%m-%d"))
+    # Built column-wise so the conversion does not need pyarrow.
+    return pd.DataFrame({
+        "date": frame["date"].to_numpy(),
+        "downloads": frame["downloads"].to_numpy(),
+        "label": pd.Categorical(frame["label"].to_numpy()),
+    })
 
 
 def get_detailed(
@@ -106,30 +317,16 @@ def get_detailed(
     granularity: str = "daily",
     include_ci: bool = True,  # placeholder for parity; not used by public v2
     api_key: Optional[str] = None,
+    backend: str = "pandas",
 ) -> pd.DataFrame:
     """
     Per-day (optionally resampled) totals across all versions.
     Returns tidy DataFrame: columns [date, downloads, label='total'].
+    ``backend="polars"`` runs the trim/resample step in polars.
     """
-    url = f"{BASE}/api/v2/projects/{project}"
-    r = requests.get(url, headers=_headers(api_key), timeout=30)
-    if r.status_code == 401:
-        raise RuntimeError("Unauthorized (401) from pepy.tech. Set PEPY_API_KEY or pass api_key.")
-    r.raise_for_status()
-
-    data = r.json()
-    rows = []
-    for date, ver_map in _parse_v2_downloads(data).items():
-        if isinstance(ver_map, dict):
-            total = sum(int(v or 0) for v in ver_map.values())
-        else:
-            total = int(ver_map or 0)
-        rows.append({"date": date, "downloads": total, "label": "total"})
-
-    df = pd.DataFrame(rows, columns=["date", "downloads", "label"])
-    df = _trim_months(df, months)
-    df = _apply_granularity(df, granularity)
-    return df
+    data = _fetch_project(project, api_key)
+    df = _v2_totals(_parse_v2_downloads(data))
+    return _finalize(df, months, granularity, backend=backend)
 
 
 def get_overall(
@@ -155,38 +352,63 @@ def get_versions(
     granularity: str = "daily",
     include_ci: bool = True,
     api_key: Optional[str] = None,
+    n_jobs: int = 1,
+    backend: str = "pandas",
 ) -> pd.DataFrame:
-    url = f"{BASE}/api/v2/projects/{project}"
-    r = requests.get(url, headers=_headers(api_key), timeout=30)
-    if r.status_code == 401:
-        raise RuntimeError("Unauthorized (401) from pepy.tech. Set PEPY_API_KEY or pass api_key.")
-    r.raise_for_status()
-
-    data = r.json()
+    """
+    Per-version (optionally resampled) series for the requested versions.
+    Returns tidy DataFrame: columns [date, downloads, label=<version>].
+    ``n_jobs`` is handed to joblib for resampling when many versions are selected;
+    ``backend="polars"`` runs the trim/resample step in polars instead.
+    """
     want = set(versions or [])
-    rows = []
-    for date, ver_map in _parse_v2_downloads(data).items():
-        if not isinstance(ver_map, dict):
-            continue
-        for ver, count in ver_map.items():
-            if not want or ver in want:
-                rows.append({"date": date, "downloads": int(count or 0), "label": ver})
+    if want and ijson is not None and not _is_cached(_session()):
+        downloads = _stream_versions(project, api_key, want)
+    else:
+        downloads = _parse_v2_downloads(_fetch_project(project, api_key))
+    df = _v2_versions(downloads, want)
+    return _finalize(df, months, granularity, n_jobs, backend)
 
-    df = pd.DataFrame(rows, columns=["date", "downloads", "label"])
-    df = _trim_months(df, months)
-    df = _apply_granularity(df, granularity)
-    return df
+
+def to_wide(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tidy → wide: one row per date, one int64 column per label, gaps filled with 0.
+    This is the table rendered by to_markdown/to_csv. Uses one groupby, not pivot_table.
+    """
+    if df["label"].nunique() == 1 and df["date"].is_unique:
+        # Common detailed/single-version case: already one row per date.
+        label = df["label"].iloc[0]
+        wide = df.set_index("date")[["downloads"]].rename(columns={"downloads": label}).sort_index()
+    else:
+        wide = df.groupby(["date", "label"], observed=True)["downloads"].sum().unstack(fill_value=0).sort_index()
+    if not (wide.dtypes == np.int64).all():
+        wide = wide.astype(np.int64)  # keep integer counts in md/csv
+    return wide
+
+
+_EMPTY_RENDER = {"md": "_no data_", "csv": ""}
+
+
+def render_wide(wide: pd.DataFrame, fmt: str) -> str:
+    """Render a to_wide() frame as ``md`` (pipe table) or ``csv`` text."""
+    if fmt not in _EMPTY_RENDER:
+        raise ValueError(f"Unknown format: {fmt!r} (expected 'md' or 'csv')")
+    if not len(wide):
+        return _EMPTY_RENDER[fmt]
+    if fmt == "md":
+        return wide.to_markdown(tablefmt="pipe")
+    buf = io.StringIO()
+    wide.to_csv(buf, lineterminator="\n", chunksize=10000)
+    return buf.getvalue()
 
 
 def to_markdown(df: pd.DataFrame) -> str:
-    if df.empty:
-        return "_no data_"
-    wide = df.pivot_table(index="date", columns="label", values="downloads", fill_value=0).sort_index()
-    return wide.to_markdown()
+    if not len(df):
+        return _EMPTY_RENDER["md"]
+    return render_wide(to_wide(df), "md")
 
 
 def to_csv(df: pd.DataFrame) -> str:
-    if df.empty:
-        return ""
-    wide = df.pivot_table(index="date", columns="label", values="downloads", fill_value=0).sort_index()
-    return wide.to_csv()
+    if not len(df):
+        return _EMPTY_RENDER["csv"]
+    return render_wide(to_wide(df), "csv")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 import argparse
 import sys
-from .api import get_overall, get_detailed, get_versions, to_markdown, to_csv
-import pandas as pd
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Optional
+from .api import get_overall, get_detailed, get_versions, to_markdown, to_csv, to_wide, render_wide
+
+if TYPE_CHECKING:  # annotations only; matplotlib is imported on --plot
+    import pandas as pd
 
 
 def _common_args(p):
@@ -19,11 +21,14 @@ def _detailed_args(p):
     p.add_argument("--plot", action="store_true", help="Plot the series with matplotlib")
 
 
-def _print_df(df: pd.DataFrame, fmt: str):
-    if fmt == "md":
-        print(to_markdown(df))
-    elif fmt == "csv":
-        print(to_csv(df), end="")
+def _print_df(df: pd.DataFrame, fmt: str, wide: Optional[pd.DataFrame] = None):
+    if fmt in ("md", "csv"):
+        # Reuse the caller's pivot when given; an empty df has none.
+        if wide is None:
+            text = to_markdown(df) if fmt == "md" else to_csv(df)
+        else:
+            text = render_wide(wide, fmt)
+        print(text, end="" if fmt == "csv" else "\n")
     else:
         if df.empty:
             print("no data")
@@ -31,6 +36,27 @@ def _print_df(df: pd.DataFrame, fmt: str):
             print(df.sort_values(["label", "date"]).to_string(index=False))
 
 
+def _plot(wide: pd.DataFrame, title: str):
+    import matplotlib.pyplot as plt
+
+    # All series drawn in one call from the wide frame.
+    ax = wide.plot()
+    ax.set_xlabel("date")
+    ax.set_ylabel("downloads")
+    ax.set_title(title)
+    plt.xticks(rotation=45, ha="right")
+    plt.tight_layout()
+    plt.show()
+
+
+def _emit(df: pd.DataFrame, args, title: str):
+    # Pivot once and share the wide frame between md/csv output and the plot.
+    wide = to_wide(df) if not df.empty and (args.fmt != "plain" or args.plot) else None
+    _print_df(df, args.fmt, wide)
+    if args.plot and wide is not None:
+        _plot(wide, title)
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(prog="pepystats", description="pepy.tech stats from the command line")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -49,6 +75,7 @@ def main(argv=None):
     _common_args(p_versions)
     _detailed_args(p_versions)
     p_versions.add_argument("--versions", nargs="+", required=True, help="One or more version strings")
+    p_versions.add_argument("--jobs", type=int, default=1, help="Parallel resampling workers (-1 = all CPUs; needs joblib)")
 
     args = parser.parse_args(argv)
 
@@ -78,19 +105,7 @@ def main(argv=None):
                 include_ci=include_ci,
                 api_key=args.api_key,
             )
-            _print_df(df, args.fmt)
-            if args.plot and not df.empty:
-                plt.figure()
-                for label, part in df.groupby("label"):
-                    part = part.sort_values("date")
-                    plt.plot(part["date"], part["downloads"], label=label)
-                plt.legend()
-                plt.xlabel("date")
-                plt.ylabel("downloads")
-                plt.title(f"{args.project} downloads")
-                plt.xticks(rotation=45, ha="right")
-                plt.tight_layout()
-                plt.show()
+            _emit(df, args, f"{args.project} downloads")
             return 0
 
         else:  # versions
@@ -101,20 +116,9 @@ def main(argv=None):
                 granularity=args.granularity,
                 include_ci=include_ci,
                 api_key=args.api_key,
+                n_jobs=args.jobs,
             )
-            _print_df(df, args.fmt)
-            if getattr(args, "plot", False) and not df.empty:
-                plt.figure()
-                for label, part in df.groupby("label"):
-                    part = part.sort_values("date")
-                    plt.plot(part["date"], part["downloads"], label=label)
-                plt.legend()
-                plt.xlabel("date")
-                plt.ylabel("downloads")
-                plt.title(f"{args.project} downloads by version")
-                plt.xticks(rotation=45, ha="right")
-                plt.tight_layout()
-                plt.show()
+            _emit(df, args, f"{args.project} downloads by version")
             return 0
 
     except Exception as e:
@@ -1,12 +1,32 @@
+import io
+import json
 import types
+import pytest
 import requests
 import pandas as pd
 
 
+class _FakeResponse(types.SimpleNamespace):
+    """Supports ``with`` and ``close()`` like requests.Response."""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def make_response(payload, status=200):
     """Minimal fake Response for requests.get."""
-    r = types.SimpleNamespace()
+    r = _FakeResponse()
     r.status_code = status
+    r.content = json.dumps(payload).encode()
+    r.raw = io.BytesIO(r.content)
 
     def json_func():
         return payload
@@ -23,3 +43,12 @@ def make_response(payload, status=200):
 def fixed_now(ts="2025-08-10T00:00:00Z"):
     """Return a tz-aware pandas Timestamp for monkeypatching Timestamp.now."""
     return pd.Timestamp(ts)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_session(monkeypatch, tmp_path):
+    """Never create a cache under the real home dir or leak the module session."""
+    import pepystats.api as api
+    monkeypatch.setenv("PEPYSTATS_NO_CACHE", "1")
+    monkeypatch.setattr(api, "CACHE_NAME", str(tmp_path / "pepystats"))
+    monkeypatch.setattr(api, "_SESSION", None)
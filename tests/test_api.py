@@ -12,14 +12,14 @@ def test_get_overall_returns_sum(monkeypatch):
             "2025-08-10": {"2.3.0": 7},
         },
     }
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: __import__("tests.conftest", fromlist=[""]).make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: __import__("tests.conftest", fromlist=[""]).make_response(payload))
     total = api.get_overall("chunkwrap", months=0)
     assert total == 10 + 5 + 0 + 4 + 7  # 26
 
 
 def test_get_overall_401_raises_runtimeerror(monkeypatch):
     monkeypatch.setattr(
-        api.requests, "get",
+        api, "_http_get",
         lambda *a, **k: __import__("tests.conftest", fromlist=[""]).make_response({}, status=401)
     )
     with pytest.raises(RuntimeError) as ei:
@@ -35,7 +35,7 @@ def test_get_detailed_happy_path(monkeypatch):
             "2025-07-02": {"1.0": 4},
         },
     }
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: __import__("tests.conftest", fromlist=[""]).make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: __import__("tests.conftest", fromlist=[""]).make_response(payload))
     df = api.get_detailed("pkg", months=0)
     assert set(df["label"]) == {"total"}
     assert df.loc[df["date"] == "2025-07-01", "downloads"].item() == 12
@@ -46,7 +46,7 @@ def test_trim_months_uses_utc_and_is_tz_safe(monkeypatch):
     cf = __import__("tests.conftest", fromlist=[""])
     monkeypatch.setattr(api.pd.Timestamp, "now", staticmethod(lambda tz=None: cf.fixed_now()))
     payload = {"downloads": {"2025-06-30": {"1.0": 1}, "2025-07-10": {"1.0": 2}, "2025-08-05": {"1.0": 3}}}
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: cf.make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
     df = api.get_detailed("pkg", months=1)
     # With zero-fill, we expect a continuous daily range between min and max
     assert df["date"].min() == "2025-07-10"
@@ -71,7 +71,7 @@ def test_granularity_weekly_resamples(monkeypatch):
         }
     }
     cf = __import__("tests.conftest", fromlist=[""])
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: cf.make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
 
     df_daily = api.get_detailed("pkg", months=0, granularity="daily")
     assert len(df_daily) == 7
@@ -103,7 +103,7 @@ def test_detailed_fills_missing_days(monkeypatch):
     }}
     import pepystats.api as api
     cf = __import__("tests.conftest", fromlist=[""])
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: cf.make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
 
     df = api.get_detailed("pkg", months=0, granularity="daily")
     assert list(df["date"]) == ["2025-08-01", "2025-08-02", "2025-08-03"]
@@ -118,9 +118,225 @@ def test_weekly_includes_empty_weeks(monkeypatch):
     }}
     import pepystats.api as api
     cf = __import__("tests.conftest", fromlist=[""])
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: cf.make_response(payload))
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
 
     df = api.get_detailed("pkg", months=0, granularity="weekly").sort_values("date")
     # Expect three consecutive Saturdays
     assert len(df) == 3
     assert 0 in df["downloads"].tolist()
+
+
+def test_http_get_reuses_module_session(monkeypatch):
+    calls = []
+    monkeypatch.setattr(api, "_SESSION", api.requests.Session())
+    monkeypatch.setattr(api._SESSION, "get", lambda url, **k: calls.append((url, k)) or "resp")
+    assert api._http_get("https://example.invalid/x", timeout=5) == "resp"
+    assert calls == [("https://example.invalid/x", {"timeout": 5})]
+
+
+def test_make_session_plain_without_cache(monkeypatch):
+    import sys
+    monkeypatch.delenv("PEPYSTATS_NO_CACHE")
+    monkeypatch.setitem(sys.modules, "requests_cache", None)
+    s = api._make_session()
+    assert type(s) is api.requests.Session
+    assert s.get_adapter("https://api.pepy.tech")._pool_maxsize == 8
+
+
+def test_v2_totals_handles_empty_and_scalar_days():
+    df = api._v2_totals({"2025-08-01": {"1.0": 2, "2.0": None}, "2025-08-02": {}})
+    assert list(df["date"]) == ["2025-08-01", "2025-08-02"]
+    assert list(df["downloads"]) == [2, 0]
+
+    df = api._v2_totals({"2025-08-01": 5, "2025-08-02": {"1.0": 1}})
+    assert list(df["downloads"]) == [5, 1]
+    assert set(df["label"]) == {"total"}
+
+
+def test_get_versions_filters_and_keeps_present_cells(monkeypatch):
+    payload = {"downloads": {
+        "2025-08-01": {"1.0": 2, "2.0": 5, "3.0": 9},
+        "2025-08-02": {"2.0": 1},
+        "2025-08-03": 7,  # not a version map → ignored
+    }}
+    cf = __import__("tests.conftest", fromlist=[""])
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
+
+    df = api.get_versions("pkg", versions=["1.0", "2.0"], months=0)
+    assert set(df["label"]) == {"1.0", "2.0"}
+    one = df[df["label"] == "1.0"]
+    assert list(one["date"]) == ["2025-08-01"]
+    two = df[df["label"] == "2.0"].sort_values("date")
+    assert list(two["downloads"]) == [5, 1]
+
+
+def test_apply_granularity_parallel_matches_serial():
+    pytest.importorskip("joblib")
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2025-08-01", "2025-08-03"] * 20),
+        "downloads": range(40),
+        "label": [f"v{i // 2}" for i in range(40)],
+    })
+    serial = api._apply_granularity(df, "daily")
+    parallel = api._apply_granularity(df, "daily", n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert len(parallel) == 20 * 3
+
+
+def test_formatters_reflect_in_place_changes():
+    df = pd.DataFrame({"date": ["2025-08-08", "2025-08-09"], "downloads": [1, 2], "label": ["A", "A"]})
+    first_csv, first_md = api.to_csv(df), api.to_markdown(df)
+    df["downloads"] *= 100
+    assert api.to_csv(df) != first_csv
+    assert api.to_markdown(df) != first_md
+    df.loc[len(df)] = ["2025-08-10", 7, "B"]
+    assert "B" in api.to_csv(df).splitlines()[0]
+
+
+@pytest.mark.parametrize("granularity", ["daily", "weekly", "monthly"])
+def test_polars_backend_matches_pandas(monkeypatch, granularity):
+    pytest.importorskip("polars")
+    payload = {"downloads": {
+        "2025-07-30": {"1.0": 2, "2.0": 1},
+        "2025-08-01": {"1.0": 4},
+        "2025-08-15": {"2.0": 3},
+    }}
+    cf = __import__("tests.conftest", fromlist=[""])
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
+
+    for fetch, kw in ((api.get_detailed, {}), (api.get_versions, {"versions": ["1.0", "2.0"]})):
+        expected = fetch("pkg", months=0, granularity=granularity, **kw).reset_index(drop=True)
+        got = fetch("pkg", months=0, granularity=granularity, backend="polars", **kw)
+        pd.testing.assert_frame_equal(expected, got, check_dtype=False)
+
+
+def test_unknown_backend_raises(monkeypatch):
+    cf = __import__("tests.conftest", fromlist=[""])
+    payload = {"downloads": {"2025-08-01": {"1.0": 1}}}
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
+    with pytest.raises(ValueError):
+        api.get_detailed("pkg", months=0, backend="spark")
+
+
+def test_cutoff_is_cached_per_day(monkeypatch):
+    cf = __import__("tests.conftest", fromlist=[""])
+    monkeypatch.setattr(api.pd.Timestamp, "now", staticmethod(lambda tz=None: cf.fixed_now()))
+    api._cutoff_for.cache_clear()
+    assert api._cutoff(1) == pd.Timestamp("2025-07-10")
+    assert api._cutoff(1) == pd.Timestamp("2025-07-10")
+    assert api._cutoff_for.cache_info().hits == 1
+
+
+def test_stream_versions_keeps_only_wanted(monkeypatch):
+    pytest.importorskip("ijson")
+    payload = {"downloads": {"2025-08-01": {"1.0": 2, "2.0": 5}, "2025-08-02": {"2.0": 1}}}
+    cf = __import__("tests.conftest", fromlist=[""])
+    seen = {}
+
+    def fake_get(*a, **k):
+        seen.update(k)
+        return cf.make_response(payload)
+
+    monkeypatch.setattr(api, "_http_get", fake_get)
+    assert api._stream_versions("pkg", None, {"1.0"}) == {"2025-08-01": {"1.0": 2}, "2025-08-02": {}}
+    assert seen["stream"] is True
+
+
+def test_single_label_csv_matches_pivot_layout():
+    df = pd.DataFrame({"date": ["2025-08-09", "2025-08-08"], "downloads": [3, 1], "label": ["total", "total"]})
+    assert api.to_csv(df) == "date,total\n2025-08-08,1\n2025-08-09,3\n"
+
+
+def test_labels_are_categorical_and_trimmed_versions_drop_out(monkeypatch):
+    cf = __import__("tests.conftest", fromlist=[""])
+    monkeypatch.setattr(api.pd.Timestamp, "now", staticmethod(lambda tz=None: cf.fixed_now()))
+    payload = {"downloads": {"2025-01-01": {"0.9": 8}, "2025-08-01": {"1.0": 1}, "2025-08-02": {"1.0": 2}}}
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: cf.make_response(payload))
+
+    df = api.get_versions("pkg", versions=[], months=1, granularity="weekly")
+    assert isinstance(df["label"].dtype, pd.CategoricalDtype)
+    assert set(df["label"]) == {"1.0"}
+    assert api.to_csv(df).splitlines()[0] == "date,1.0"
+
+
+def test_get_versions_skips_streaming_with_cached_session(monkeypatch):
+    requests_cache = pytest.importorskip("requests_cache")
+    pytest.importorskip("ijson")
+    payload = {"downloads": {"2025-08-01": {"1.0": 2, "2.0": 5}}}
+    cf = __import__("tests.conftest", fromlist=[""])
+    seen = []
+
+    def fake_get(*a, **k):
+        seen.append(k.get("stream", False))
+        return cf.make_response(payload)
+
+    monkeypatch.setattr(api, "_SESSION", requests_cache.CachedSession(backend="memory"))
+    monkeypatch.setattr(api, "_http_get", fake_get)
+    df = api.get_versions("pkg", versions=["1.0"], months=0)
+    assert seen == [False]
+    assert list(df["downloads"]) == [2]
+
+
+def test_to_wide_is_public_and_zero_fills():
+    import pepystats
+    df = pd.DataFrame({"date": ["2025-08-08", "2025-08-08", "2025-08-09"], "downloads": [1, 2, 3], "label": ["A", "B", "A"]})
+    wide = pepystats.to_wide(df)
+    assert list(wide.columns) == ["A", "B"]
+    assert wide.loc["2025-08-09", "B"] == 0
+    assert (wide.dtypes == "int64").all()
+
+
+def test_polars_backend_without_polars_raises(monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "polars", None)
+    df = pd.DataFrame({"date": ["2025-08-01"], "downloads": [1], "label": ["total"]})
+    with pytest.raises(ImportError, match="pepystats\\[polars\\]"):
+        api._finalize(df, 0, "daily", backend="polars")
+
+
+def test_apply_granularity_falls_back_to_serial_without_joblib(monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "joblib", None)
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2025-08-01", "2025-08-03"] * 20),
+        "downloads": range(40),
+        "label": [f"v{i // 2}" for i in range(40)],
+    })
+    assert len(api._apply_granularity(df, "daily", n_jobs=2)) == 20 * 3
+
+
+@pytest.mark.parametrize("value, cached", [("1", False), ("true", False), ("0", True), ("", True)])
+def test_no_cache_env_needs_a_truthy_value(monkeypatch, value, cached):
+    pytest.importorskip("requests_cache")
+    monkeypatch.setenv("PEPYSTATS_NO_CACHE", value)
+    assert api._is_cached(api._make_session()) is cached
+
+
+def test_render_wide_matches_formatters():
+    df = pd.DataFrame({"date": ["2025-08-08", "2025-08-08"], "downloads": [1, 2], "label": ["A", "B"]})
+    wide = api.to_wide(df)
+    assert api.render_wide(wide, "md") == api.to_markdown(df)
+    assert api.render_wide(wide, "csv") == api.to_csv(df)
+    assert api.render_wide(wide.iloc[:0], "md") == api.to_markdown(df.iloc[:0]) == "_no data_"
+    with pytest.raises(ValueError):
+        api.render_wide(wide, "json")
+
+
+def test_stream_versions_closes_response_on_parse_error(monkeypatch):
+    pytest.importorskip("ijson")
+    cf = __import__("tests.conftest", fromlist=[""])
+    resp = cf.make_response({})
+    resp.raw = __import__("io").BytesIO(b'{"downloads": {"2025-08-01": {"1.0": ')  # truncated body
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: resp)
+    with pytest.raises(Exception):
+        api._stream_versions("pkg", None, {"1.0"})
+    assert resp.closed
+
+
+def test_get_project_closes_response_on_http_error(monkeypatch):
+    cf = __import__("tests.conftest", fromlist=[""])
+    resp = cf.make_response({}, status=500)
+    monkeypatch.setattr(api, "_http_get", lambda *a, **k: resp)
+    with pytest.raises(api.requests.exceptions.HTTPError):
+        api._get_project("pkg", None, stream=True)
+    assert resp.closed
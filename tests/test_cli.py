@@ -7,8 +7,8 @@ import pepystats.cli as cli
 def _run_cli(argv, payload, status=200):
     import pepystats.api as api
     cf = __import__("tests.conftest", fromlist=[""])
-    old_get = api.requests.get
-    api.requests.get = lambda *a, **k: cf.make_response(payload, status=status)
+    old_get = api._http_get
+    api._http_get = lambda *a, **k: cf.make_response(payload, status=status)
     try:
         old_stdout = sys.stdout
         sys.stdout = io.StringIO()
@@ -18,7 +18,7 @@ def _run_cli(argv, payload, status=200):
             rc = e.code
         out = sys.stdout.getvalue()
     finally:
-        api.requests.get = old_get
+        api._http_get = old_get
         sys.stdout = old_stdout
     return rc, out
 
@@ -52,3 +52,40 @@ def test_cli_handles_http_error(monkeypatch):
     payload = {}
     rc, out = _run_cli(["overall", "pkg", "--months", "0"], payload, status=500)
     assert rc not in (None, 0)
+
+
+def test_cli_import_does_not_load_matplotlib():
+    import subprocess
+    code = "import sys, pepystats.cli; sys.exit(any(m in sys.modules for m in ('matplotlib.pyplot', 'polars', 'joblib', 'requests_cache')))"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_cli_versions_plot_draws_one_line_per_version(monkeypatch):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    shown = []
+    monkeypatch.setattr(plt, "show", lambda: shown.append(plt.gca()))
+    payload = {"downloads": {"2025-08-08": {"1.0": 1, "2.0": 5}, "2025-08-09": {"1.0": 2}}}
+    rc, _ = _run_cli(["versions", "pkg", "--versions", "1.0", "2.0", "--plot", "--months", "0"], payload)
+    assert rc in (None, 0)
+    assert len(shown) == 1
+    ax = shown[0]
+    assert len(ax.get_lines()) == 2
+    assert ax.get_title() == "pkg downloads by version"
+    plt.close("all")
+
+
+def test_cli_csv_matches_api_to_csv():
+    import pepystats.api as api
+    payload = {"downloads": {"2025-08-08": {"1.0": 1, "2.0": 5}, "2025-08-09": {"1.0": 2}}}
+    rc, out = _run_cli(["versions", "pkg", "--versions", "1.0", "2.0", "--fmt", "csv", "--months", "0"], payload)
+    cf = __import__("tests.conftest", fromlist=[""])
+    old_get = api._http_get
+    api._http_get = lambda *a, **k: cf.make_response(payload)
+    try:
+        expected = api.to_csv(api.get_versions("pkg", versions=["1.0", "2.0"], months=0))
+    finally:
+        api._http_get = old_get
+    assert rc in (None, 0)
+    assert out == expected